@@ -0,0 +1,36 @@
+"""
+Django settings used when running the test suite.
+
+Extends the default project settings with overrides that only make sense
+for tests.
+"""
+
+import os
+
+from app.settings import *  # noqa: F401,F403
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/2.1/topics/testing/overview/#speeding-up-the-tests
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+
+# Database
+# The API tests only rely on the ORM, so they run against an in-memory
+# SQLite database by default. Set TEST_DB=postgres to run them against the
+# Postgres database from settings.py instead (use `pytest --reuse-db` to
+# keep that test database between runs).
+
+if os.environ.get('TEST_DB') != 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+            'TEST': {
+                'NAME': ':memory:',
+            },
+        }
+    }
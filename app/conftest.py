@@ -0,0 +1,23 @@
+import copy
+
+import pytest
+
+from rest_framework import serializers
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_model_serializer_fields():
+    """Build the fields of each ModelSerializer class only once"""
+    get_fields = serializers.ModelSerializer.get_fields
+    cache = {}
+
+    def cached_get_fields(self):
+        if type(self) not in cache:
+            cache[type(self)] = get_fields(self)
+        # Hand out copies like DRF does for declared fields, so nested
+        # serializers are rebuilt and bound to the new parent
+        return copy.deepcopy(cache[type(self)])
+
+    serializers.ModelSerializer.get_fields = cached_get_fields
+    yield
+    serializers.ModelSerializer.get_fields = get_fields
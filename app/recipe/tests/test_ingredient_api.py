@@ -8,6 +8,7 @@ from rest_framework import status
 from core.models import Ingredient, Recipe
 
 from recipe.serializers import IngredientSerializer
+from recipe.tests.utils import attach_ingredients
 
 INGREDIENTS_URL = reverse('recipe:ingredient-list')
 
@@ -29,27 +30,33 @@ class PublicIngredientsApiTests(TestCase):
 class PrivateIngredientsApiTests(TestCase):
     """Test the private available ingredients API"""
 
-    def setUp(self):
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             email='test@gmail.com',
             password='testp1245'
         )
+
+    def setUp(self):
         self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_ingredient_list(self):
         """Test retrieving a list of ingredients"""
 
-        Ingredient.objects.create(user=self.user, name='Cucumber')
-        Ingredient.objects.create(user=self.user, name='Tomatoes')
+        Ingredient.objects.bulk_create([
+            Ingredient(user=self.user, name='Cucumber'),
+            Ingredient(user=self.user, name='Tomatoes'),
+        ])
 
-        res = self.client.get(INGREDIENTS_URL)
-
-        ingredients = Ingredient.objects.all().order_by('-name')
-        serializer = IngredientSerializer(ingredients, many=True)
+        with self.assertNumQueries(1):
+            res = self.client.get(INGREDIENTS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(
+            [ingredient['name'] for ingredient in res.data],
+            ['Tomatoes', 'Cucumber']
+        )
 
     def test_ingredients_limited_to_user(self):
         """Test that ingredients returned are for the authenticated user"""
@@ -75,13 +82,8 @@ class PrivateIngredientsApiTests(TestCase):
 
         res = self.client.post(INGREDIENTS_URL, payload)
 
-        exists = Ingredient.objects.filter(
-            user=self.user,
-            name=payload['name']
-        ).exists()
-
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        self.assertTrue(exists)
+        self.assertEqual(res.data['name'], payload['name'])
 
     def test_create_ingredient_invalid(self):
         """Test creating a new ingredient with invalid payload"""
@@ -107,12 +109,13 @@ class PrivateIngredientsApiTests(TestCase):
 
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
-        serializer_1 = IngredientSerializer(ingredient_1)
-        serializer_2 = IngredientSerializer(ingredient_2)
+        serialized = IngredientSerializer(
+            [ingredient_1, ingredient_2], many=True
+        ).data
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer_1.data, res.data)
-        self.assertNotIn(serializer_2.data, res.data)
+        self.assertIn(serialized[0], res.data)
+        self.assertNotIn(serialized[1], res.data)
 
     def test_retrieve_ingredients_assigned_unique(self):
         """Test filtering ingredients by assigned returns unique items"""
@@ -126,8 +129,7 @@ class PrivateIngredientsApiTests(TestCase):
             user=self.user, title='Chakchouka',
             time_minutes=30, price=5
         )
-        recipe_1.ingredients.add(ingredient)
-        recipe_2.ingredients.add(ingredient)
+        attach_ingredients((recipe_1, ingredient), (recipe_2, ingredient))
 
         res = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
 
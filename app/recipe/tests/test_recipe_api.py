@@ -1,11 +1,12 @@
-import tempfile
+import functools
 import os
-
-from PIL import Image
+import shutil
+import tempfile
 
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -13,15 +14,28 @@ from rest_framework import status
 from core.models import Recipe, Tag, Ingredient
 
 from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
+from recipe.tests.utils import attach_tags, attach_ingredients
 
 RECIPE_URL = reverse('recipe:recipe-list')
 
+# Smallest valid JPEG: a single grayscale pixel
+_TINY_JPEG = bytes.fromhex(
+    'ffd8ffe000104a46494600010100000100010000'  # SOI, JFIF header
+    'ffdb004300' + 'ff' * 64 +  # quantization table
+    'ffc0000b080001000101011100'  # 1x1 grayscale frame
+    'ffc40014000100000000000000000000000000000003'  # DC huffman table
+    'ffc40014100100000000000000000000000000000000'  # AC huffman table
+    'ffda0008010100003f0037ffd9'  # scan data, EOI
+)
+
 
+@functools.lru_cache(maxsize=None)
 def image_upload_url(recipe_id):
     """Return an url for an image upload"""
     return reverse('recipe:recipe-upload-image', args=[recipe_id])
 
 
+@functools.lru_cache(maxsize=None)
 def detail_url(recipe_id):
     """Return recipe detail URL"""
     return reverse('recipe:recipe-detail', args=[recipe_id])
@@ -37,18 +51,29 @@ def sample_ingredient(user, name='Sugar'):
     return Ingredient.objects.create(user=user, name=name)
 
 
+SAMPLE_RECIPE_DEFAULTS = {
+    'title': 'Sample recipe',
+    'time_minutes': 10,
+    "price": 5.00
+}
+
+
 def sample_recipe(user, **params):
     """Create a sample recipe"""
-    defaults = {
-        'title': 'Sample recipe',
-        'time_minutes': 10,
-        "price": 5.00
-    }
+    defaults = dict(SAMPLE_RECIPE_DEFAULTS)
     defaults.update(params)
 
     return Recipe.objects.create(user=user, **defaults)
 
 
+def bulk_recipes(user, titles):
+    """Create sample recipes with the given titles in a single query"""
+    return Recipe.objects.bulk_create([
+        Recipe(user=user, **dict(SAMPLE_RECIPE_DEFAULTS, title=title))
+        for title in titles
+    ])
+
+
 class PublicRecipeApiTests(TestCase):
     """Test the public available recipe API"""
 
@@ -66,26 +91,29 @@ class PublicRecipeApiTests(TestCase):
 class PrivateRecipeApiTests(TestCase):
     """Test the authorised recipe API"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             email='test@gmail.com',
             password='test1245'
         )
+
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_recipes(self):
         """Test retrieving recipes"""
-        sample_recipe(user=self.user)
-        sample_recipe(user=self.user)
+        bulk_recipes(user=self.user, titles=['Massefouf', 'Chakchouka'])
 
-        recipes = Recipe.objects.all().order_by('-id')
-        serializer = RecipeSerializer(recipes, many=True)
-
-        res = self.client.get(RECIPE_URL)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(
+            [recipe['title'] for recipe in res.data],
+            ['Chakchouka', 'Massefouf']
+        )
 
     def test_retrived_recipes_limited(self):
         """Test that retrieved recipes are for current authenticated user"""
@@ -94,17 +122,14 @@ class PrivateRecipeApiTests(TestCase):
             password='pass1245'
         )
 
-        sample_recipe(user=self.user)
+        recipe = sample_recipe(user=self.user)
         sample_recipe(user=user_2)
 
         res = self.client.get(RECIPE_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
-
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data[0]['id'], recipe.id)
 
     def test_view_recipe_detail(self):
         """Test viewibg a recipe details"""
@@ -113,8 +138,12 @@ class PrivateRecipeApiTests(TestCase):
         recipe.ingredients.add(sample_ingredient(user=self.user))
 
         url = detail_url(recipe.id)
-        res = self.client.get(url)
+        with self.assertNumQueries(3):
+            res = self.client.get(url)
 
+        recipe = Recipe.objects.prefetch_related(
+            'tags', 'ingredients'
+        ).get(pk=recipe.pk)
         serializer = RecipeDetailSerializer(recipe)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -133,7 +162,9 @@ class PrivateRecipeApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        recipe = Recipe.objects.get(id=res.data['id'])
+        recipe = Recipe.objects.only(
+            'title', 'time_minutes', 'price'
+        ).get(id=res.data['id'])
         for key in payload.keys():
             self.assertEqual(payload[key], getattr(recipe, key))
 
@@ -156,7 +187,7 @@ class PrivateRecipeApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        recipe = Recipe.objects.get(id=res.data['id'])
+        recipe = Recipe.objects.only('id').get(id=res.data['id'])
         tags = recipe.tags.all()
 
         self.assertEqual(tags.count(), 2)
@@ -181,7 +212,7 @@ class PrivateRecipeApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        recipe = Recipe.objects.get(id=res.data['id'])
+        recipe = Recipe.objects.only('id').get(id=res.data['id'])
         ingredients = recipe.ingredients.all()
 
         self.assertEqual(ingredients.count(), 2)
@@ -201,7 +232,7 @@ class PrivateRecipeApiTests(TestCase):
 
         self.client.patch(url, payload)
 
-        recipe.refresh_from_db()
+        recipe.refresh_from_db(fields=['title'])
         tags = recipe.tags.all()
 
         self.assertEqual(recipe.title, payload['title'])
@@ -221,7 +252,7 @@ class PrivateRecipeApiTests(TestCase):
 
         self.client.put(url, payload)
 
-        recipe.refresh_from_db()
+        recipe.refresh_from_db(fields=['title', 'time_minutes', 'price'])
         tags = recipe.tags.all()
 
         self.assertEqual(recipe.title, payload['title'])
@@ -236,18 +267,21 @@ class PrivateRecipeApiTests(TestCase):
         recipe_3 = sample_recipe(user=self.user, title='Chawarma')
         tag_1 = sample_tag(user=self.user, name='Vegetarian')
         tag_2 = sample_tag(user=self.user, name='Vegan')
-        recipe_1.tags.add(tag_1)
-        recipe_2.tags.add(tag_2)
+        attach_tags((recipe_1, tag_1), (recipe_2, tag_2))
 
-        serializer_1 = RecipeSerializer(recipe_1)
-        serializer_2 = RecipeSerializer(recipe_2)
-        serializer_3 = RecipeSerializer(recipe_3)
+        serialized = RecipeSerializer(
+            [recipe_1, recipe_2, recipe_3], many=True
+        ).data
 
-        res = self.client.get(RECIPE_URL, {'tags': f'{tag_1.id},{tag_2.id}'})
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                RECIPE_URL,
+                {'tags': f'{tag_1.id},{tag_2.id}'}
+            )
 
-        self.assertIn(serializer_1.data, res.data)
-        self.assertIn(serializer_2.data, res.data)
-        self.assertNotIn(serializer_3.data, res.data)
+        self.assertIn(serialized[0], res.data)
+        self.assertIn(serialized[1], res.data)
+        self.assertNotIn(serialized[2], res.data)
 
     def test_filter_recipes_by_ingredients(self):
         """Test filter recipes by ingredients"""
@@ -256,32 +290,48 @@ class PrivateRecipeApiTests(TestCase):
         recipe_3 = sample_recipe(user=self.user, title='Chawarma')
         ingredient_1 = sample_ingredient(user=self.user, name='semoule')
         ingredient_2 = sample_ingredient(user=self.user, name='salt')
-        recipe_1.ingredients.add(ingredient_1)
-        recipe_2.ingredients.add(ingredient_2)
+        attach_ingredients((recipe_1, ingredient_1), (recipe_2, ingredient_2))
 
-        serializer_1 = RecipeSerializer(recipe_1)
-        serializer_2 = RecipeSerializer(recipe_2)
-        serializer_3 = RecipeSerializer(recipe_3)
+        serialized = RecipeSerializer(
+            [recipe_1, recipe_2, recipe_3], many=True
+        ).data
 
-        res = self.client.get(
-            RECIPE_URL,
-            {'ingredients': f'{ingredient_1.id},{ingredient_2.id}'}
-        )
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                RECIPE_URL,
+                {'ingredients': f'{ingredient_1.id},{ingredient_2.id}'}
+            )
 
-        self.assertIn(serializer_1.data, res.data)
-        self.assertIn(serializer_2.data, res.data)
-        self.assertNotIn(serializer_3.data, res.data)
+        self.assertIn(serialized[0], res.data)
+        self.assertIn(serialized[1], res.data)
+        self.assertNotIn(serialized[2], res.data)
 
 
 class RecipeImageUploadTests(TestCase):
     """Test recipe image upload"""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='test@gmail', password='sfhiihfd1245')
+        cls.recipe = sample_recipe(user=cls.user)
+
     def setUp(self):
         self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
-            email='test@gmail', password='sfhiihfd1245')
         self.client.force_authenticate(user=self.user)
-        self.recipe = sample_recipe(user=self.user)
 
     def tearDown(self):
         self.recipe.image.delete()
@@ -289,13 +339,11 @@ class RecipeImageUploadTests(TestCase):
     def test_upload_image_to_recipe(self):
         """Test uploading image to recipe"""
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as ntf:
-            img = Image.new('RGB', (10, 10))
-            img.save(ntf, format='JPEG')
-            ntf.seek(0)
-            res = self.client.post(url, {'image': ntf}, format='multipart')
+        image = SimpleUploadedFile('image.jpg', _TINY_JPEG, 'image/jpeg')
+
+        res = self.client.post(url, {'image': image}, format='multipart')
 
-        self.recipe.refresh_from_db()
+        self.recipe.refresh_from_db(fields=['image'])
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn('image', res.data)
         self.assertTrue(os.path.exists(path=self.recipe.image.path))
@@ -8,6 +8,7 @@ from rest_framework.test import APIClient
 from core.models import Tag, Recipe
 
 from recipe.serializers import TagSerializer
+from recipe.tests.utils import attach_tags
 
 
 TAGS_URL = reverse('recipe:tag-list')
@@ -29,27 +30,33 @@ class PublicTagsApiTests(TestCase):
 class PrivateTagsApiTests(TestCase):
     """Test the authorised user tags API"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             email='test@gmail.com',
             name='testo',
             password='pasw12485'
         )
+
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_tags(self):
         """Test retrieve tags"""
-        Tag.objects.create(user=self.user, name='Vegan')
-        Tag.objects.create(user=self.user, name='Desert')
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name='Vegan'),
+            Tag(user=self.user, name='Desert'),
+        ])
 
-        res = self.client.get(TAGS_URL)
-
-        tags = Tag.objects.all().order_by('-name')
-        serializer = TagSerializer(tags, many=True)
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(
+            [tag['name'] for tag in res.data],
+            ['Vegan', 'Desert']
+        )
 
     def test_tags_limited_to_user(self):
         """Test that tags returned are for the authenticated user"""
@@ -73,13 +80,8 @@ class PrivateTagsApiTests(TestCase):
 
         res = self.client.post(TAGS_URL, payload)
 
-        exists = Tag.objects.filter(
-            user=self.user,
-            name=payload['name']
-        ).exists()
-
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        self.assertTrue(exists)
+        self.assertEqual(res.data['name'], payload['name'])
 
     def test_create_tag_invalid(self):
         """Test creating a new  tag with invalid payload"""
@@ -100,12 +102,11 @@ class PrivateTagsApiTests(TestCase):
 
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
-        serializer_1 = TagSerializer(tag_1)
-        serializer_2 = TagSerializer(tag_2)
+        serialized = TagSerializer([tag_1, tag_2], many=True).data
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer_1.data, res.data)
-        self.assertNotIn(serializer_2.data, res.data)
+        self.assertIn(serialized[0], res.data)
+        self.assertNotIn(serialized[1], res.data)
 
     def test_retrieve_tags_assigned_unique(self):
         """Test filtering tags by assigned returns unique items"""
@@ -119,8 +120,7 @@ class PrivateTagsApiTests(TestCase):
             user=self.user, title='Chakchouka',
             time_minutes=30, price=5
         )
-        recipe_1.tags.add(tag)
-        recipe_2.tags.add(tag)
+        attach_tags((recipe_1, tag), (recipe_2, tag))
 
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
@@ -0,0 +1,18 @@
+from core.models import Recipe
+
+
+def attach_tags(*pairs):
+    """Link (recipe, tag) pairs in a single query"""
+    through = Recipe.tags.through
+    through.objects.bulk_create([
+        through(recipe_id=recipe.id, tag_id=tag.id) for recipe, tag in pairs
+    ])
+
+
+def attach_ingredients(*pairs):
+    """Link (recipe, ingredient) pairs in a single query"""
+    through = Recipe.ingredients.through
+    through.objects.bulk_create([
+        through(recipe_id=recipe.id, ingredient_id=ingredient.id)
+        for recipe, ingredient in pairs
+    ])